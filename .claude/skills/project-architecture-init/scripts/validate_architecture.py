@@ -11,14 +11,31 @@ Checks:
 Usage:
     validate_architecture.py <project-root> --config <architecture-config.json>
     validate_architecture.py <project-root>  (uses default rules)
+
+Import scan results are cached in <project-root>/.cache/architecture.json
+(override with "scan_cache" in the config, or set it to null to disable) so
+unchanged files are not re-read on the next run.
 """
 
 import json
+import mmap
 import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+DEFAULT_SCAN_CACHE = ".cache/architecture.json"
+# Bump whenever the import heuristics change so stale results are discarded
+SCAN_CACHE_VERSION = 3
+
+# A module counts as imported when its name follows one of these on a line.
+# Sources are scanned as raw bytes, so nothing is decoded.
+IMPORT_KEYWORD = re.compile(rb'from\s+["\']?|import\s+|require\s*\(')
+# Files at least this large are scanned through mmap instead of being read
+# into memory
+MMAP_MIN_SIZE = 1 << 20
+
 
 def load_config(config_path):
     """Load architecture configuration from JSON file."""
@@ -74,85 +91,281 @@ def check_test_mirror(project_root, src_dir, test_dir):
         return [f"Test directory not found: {test_dir}"]
 
     # Find all module directories in source
-    for item in os.listdir(src_path):
-        item_path = os.path.join(src_path, item)
-        if os.path.isdir(item_path) and not item.startswith('.') and not item.startswith('__'):
-            test_counterpart = os.path.join(test_path, item)
-            if not os.path.isdir(test_counterpart):
-                issues.append(
-                    f"Source module '{src_dir}/{item}' has no test counterpart at '{test_dir}/{item}'"
-                )
+    with os.scandir(src_path) as entries:
+        module_names = [
+            entry.name for entry in entries
+            if entry.is_dir() and not entry.name.startswith(('.', '__'))
+        ]
+
+    for item in module_names:
+        test_counterpart = os.path.join(test_path, item)
+        if not os.path.isdir(test_counterpart):
+            issues.append(
+                f"Source module '{src_dir}/{item}' has no test counterpart at '{test_dir}/{item}'"
+            )
 
     return issues
 
 
-def check_circular_deps_basic(project_root, modules_dir):
-    """Basic circular dependency check by analyzing import statements."""
+def iter_files(top):
+    """Yield a DirEntry for every file under top, like os.walk without re-stat'ing.
+
+    Symlinked directories are listed but not descended into, matching os.walk's
+    default; unreadable directories are skipped.
+    """
+    pending = [top]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            pending.append(entry.path)
+                    else:
+                        yield entry
+        except OSError:
+            continue
+
+
+def read_source(path):
+    """Return a source file's raw bytes."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def load_scan_cache(cache_path, module_names):
+    """Load cached per-file scan results, or {} if missing, stale or unreadable.
+
+    Results depend on which modules exist, so the cache is only reused when
+    the module set and the heuristics version both match.
+    """
+    try:
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+    except (IOError, OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    if cache.get("version") != SCAN_CACHE_VERSION or cache.get("modules") != module_names:
+        return {}
+    files = cache.get("files")
+    if not isinstance(files, dict):
+        return {}
+    # Drop malformed entries rather than failing on them; they are rescanned
+    return {
+        path: entry for path, entry in files.items()
+        if isinstance(entry, list) and len(entry) == 3 and isinstance(entry[2], list)
+        and all(isinstance(dep, str) for dep in entry[2])
+    }
+
+
+def save_scan_cache(cache_path, module_names, files):
+    """Write per-file scan results; failures only cost the next run a rescan."""
+    cache = {"version": SCAN_CACHE_VERSION, "modules": module_names, "files": files}
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    except (IOError, OSError):
+        pass
+
+
+def imports_module(content, name):
+    """Return True if name appears after an import keyword on the same line.
+
+    content is any bytes-like buffer with find/rfind (bytes or mmap) and name
+    the encoded module name.
+
+    Most files never mention most modules, so name is located with a plain
+    substring search and the keyword pattern only runs on those lines. Each
+    line is examined at most once and the pattern has no unbounded wildcard
+    to backtrack over, so the scan stays linear even on pathological input.
+    """
+    pos = content.find(name)
+    while pos != -1:
+        line_start = content.rfind(b'\n', 0, pos) + 1
+        line_end = content.find(b'\n', pos)
+        if line_end == -1:
+            line_end = len(content)
+        keyword = IMPORT_KEYWORD.search(content, line_start, line_end)
+        if keyword and content.find(name, keyword.end(), line_end) != -1:
+            return True
+        pos = content.find(name, line_end)
+    return False
+
+
+def scan_source(task):
+    """Return (module_name, path, stat, modules it imports) for one scan task.
+
+    The imports are None if the file could not be read.
+    """
+    module_name, path, st, others = task
+    # Simple heuristic: check if module name appears in imports
+    try:
+        if st.st_size >= MMAP_MIN_SIZE:
+            with open(path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                found = {name for name, key in others if imports_module(content, key)}
+        else:
+            content = read_source(path)
+            found = {name for name, key in others if imports_module(content, key)}
+    except (IOError, OSError, ValueError):
+        # ValueError: the file was truncated to empty before it could be mapped
+        found = None
+
+    return module_name, path, st, found
+
+
+def strongly_connected_components(graph):
+    """Return the strongly connected components of a dependency graph.
+
+    Iterative Tarjan's algorithm: O(V + E) with no recursion, so deep graphs
+    cannot hit the interpreter recursion limit.
+    """
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        frames = [(root, iter(sorted(graph[root])))]
+
+        while frames:
+            node, neighbors = frames[-1]
+            for neighbor in neighbors:
+                if neighbor not in index:
+                    index[neighbor] = lowlink[neighbor] = len(index)
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    frames.append((neighbor, iter(sorted(graph.get(neighbor, ())))))
+                    break
+                if neighbor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[neighbor])
+            else:
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def find_cycle(graph, members):
+    """Return one cycle within members as a path that ends where it starts.
+
+    Iterative DFS restricted to the component; the current path lives in a
+    single list and set that are pushed and popped, never copied.
+    """
+    start = min(members)
+    path = [start]
+    on_path = {start}
+    done = set()
+    frames = [iter(sorted(graph[start] & members))]
+
+    while frames:
+        for neighbor in frames[-1]:
+            if neighbor in on_path:
+                return path[path.index(neighbor):] + [neighbor]
+            if neighbor not in done:
+                path.append(neighbor)
+                on_path.add(neighbor)
+                frames.append(iter(sorted(graph[neighbor] & members)))
+                break
+        else:
+            frames.pop()
+            node = path.pop()
+            on_path.discard(node)
+            done.add(node)
+
+    return None
+
+
+def check_circular_deps_basic(project_root, modules_dir, cache_file=DEFAULT_SCAN_CACHE):
+    """Basic circular dependency check by analyzing import statements.
+
+    Files whose mtime and size match the scan cache reuse their recorded
+    imports instead of being read again; pass cache_file=None to disable.
+    """
     issues = []
     modules_path = os.path.join(project_root, modules_dir)
 
     if not os.path.isdir(modules_path):
         return []
 
-    # Build a simple dependency graph
-    deps = {}
-    for module_name in os.listdir(modules_path):
-        module_path = os.path.join(modules_path, module_name)
-        if not os.path.isdir(module_path) or module_name.startswith('.'):
-            continue
-        deps[module_name] = set()
-
-        for root, _dirs, files in os.walk(module_path):
-            for fname in files:
-                if not fname.endswith(('.py', '.ts', '.js', '.java', '.kt', '.go')):
-                    continue
-                fpath = os.path.join(root, fname)
-                try:
-                    with open(fpath, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                except (IOError, OSError):
+    with os.scandir(modules_path) as entries:
+        modules = {
+            entry.name: entry.path for entry in entries
+            if entry.is_dir() and not entry.name.startswith('.')
+        }
+
+    module_names = sorted(modules)
+    cache_path = os.path.join(project_root, cache_file) if cache_file else None
+    cached_files = load_scan_cache(cache_path, module_names) if cache_path else {}
+    scanned_files = {}
+
+    # Collect every source file first; each one is scanned independently
+    deps = {module_name: set() for module_name in modules}
+    tasks = []
+    for module_name, module_path in modules.items():
+        others = tuple(
+            (name, os.fsencode(name)) for name in modules if name != module_name
+        )
+        for entry in iter_files(module_path):
+            if not entry.name.endswith(('.py', '.ts', '.js', '.java', '.kt', '.go')):
+                continue
+            try:
+                st = entry.stat()
+            except (IOError, OSError):
+                continue
+            cached = cached_files.get(entry.path)
+            if cached and cached[:2] == [st.st_mtime_ns, st.st_size]:
+                deps[module_name].update(cached[2])
+                scanned_files[entry.path] = cached
+            else:
+                tasks.append((module_name, entry.path, st, others))
+
+    # Build a simple dependency graph, reading changed files on a thread pool
+    if tasks:
+        workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for module_name, path, st, found in executor.map(scan_source, tasks):
+                if found is None:
+                    # Left out of the cache so the next run reads it again;
+                    # fixing permissions does not change mtime or size
                     continue
+                deps[module_name].update(found)
+                scanned_files[path] = [st.st_mtime_ns, st.st_size, sorted(found)]
 
-                for other_module in os.listdir(modules_path):
-                    if other_module == module_name or other_module.startswith('.'):
-                        continue
-                    # Simple heuristic: check if module name appears in imports
-                    patterns = [
-                        rf'from\s+["\']?.*{re.escape(other_module)}',
-                        rf'import\s+.*{re.escape(other_module)}',
-                        rf'require\s*\(.*{re.escape(other_module)}',
-                    ]
-                    for pattern in patterns:
-                        if re.search(pattern, content):
-                            deps[module_name].add(other_module)
-                            break
+    if cache_path and (tasks or len(scanned_files) != len(cached_files)):
+        save_scan_cache(cache_path, module_names, scanned_files)
 
-    # Detect cycles
-    visited = set()
-    rec_stack = set()
-
-    def has_cycle(node, path):
-        visited.add(node)
-        rec_stack.add(node)
-        for neighbor in deps.get(node, set()):
-            if neighbor not in visited:
-                cycle = has_cycle(neighbor, path + [node])
-                if cycle:
-                    return cycle
-            elif neighbor in rec_stack:
-                cycle_path = path + [node, neighbor]
-                start = cycle_path.index(neighbor)
-                return cycle_path[start:]
-        rec_stack.discard(node)
-        return None
-
-    for module in deps:
-        if module not in visited:
-            cycle = has_cycle(module, [])
-            if cycle:
-                issues.append(
-                    f"Circular dependency detected: {' -> '.join(cycle)}"
-                )
+    # Detect cycles: every multi-module component (or self-import) has one
+    for component in strongly_connected_components(deps):
+        if len(component) == 1 and component[0] not in deps[component[0]]:
+            continue
+        members = set(component)
+        cycle = find_cycle(deps, members)
+        issue = f"Circular dependency detected: {' -> '.join(cycle)}"
+        if len(members) > len(cycle) - 1:
+            issue += f" (component: {', '.join(sorted(members))})"
+        issues.append(issue)
 
     return issues
 
@@ -160,6 +373,9 @@ def check_circular_deps_basic(project_root, modules_dir):
 def validate(project_root, config):
     """Run all validation checks and return issues."""
     all_issues = []
+    # Normalize once so every check joins onto the same absolute root and
+    # scan cache keys do not depend on the working directory
+    project_root = os.path.abspath(project_root)
 
     print(f"Validating project architecture at: {project_root}")
     print("=" * 60)
@@ -200,7 +416,9 @@ def validate(project_root, config):
     # Check circular dependencies (if modules dir configured)
     modules_dir = config.get("modules_dir")
     if modules_dir:
-        cycle_issues = check_circular_deps_basic(project_root, modules_dir)
+        cycle_issues = check_circular_deps_basic(
+            project_root, modules_dir, config.get("scan_cache", DEFAULT_SCAN_CACHE)
+        )
         if cycle_issues:
             all_issues.extend(cycle_issues)
             for issue in cycle_issues:
@@ -19,9 +19,12 @@ Examples:
 """
 
 import argparse
+import ast
+import bisect
 import os
 import re
 import sys
+import tokenize
 
 
 def detect_file_type(file_path: str) -> str:
@@ -37,8 +40,34 @@ def detect_file_type(file_path: str) -> str:
     return type_map.get(ext, "unknown")
 
 
+DOCSTRING_OWNERS = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+# Fields holding nested statements (handlers and cases hold nodes with a body)
+STATEMENT_FIELDS = frozenset(("body", "orelse", "finalbody", "handlers", "cases"))
+
+# A stripped Python code line starts at most one of these; lastgroup names
+# the metric to bump
+PY_CODE = re.compile(
+    r"(?P<functions>(?:async\s+)?def\s+\w)"
+    r"|(?P<classes>class\s+\w)"
+    r"|(?P<imports>(?:import|from) )"
+)
+TRIPLE_QUOTE = re.compile(r'"""|\'\'\'')
+JS_FUNCTION = re.compile(r"function\s+\w+|const\s+\w+\s*=\s*(?:async\s+)?\(|=>\s*\{")
+JS_CLASS = re.compile(r"^(?:export\s+)?(?:abstract\s+)?class\s+\w+")
+
+
 def analyze_python(content: str) -> dict:
-    """Analyze Python code."""
+    """Analyze Python code.
+
+    Uses the ast module, tokenizing only the few statements where a "#" line
+    may be string content; sources that do not parse (Python 2, fragments, or
+    nesting too deep for the parser) fall back to the line-based heuristics.
+    """
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return analyze_python_lines(content)
+
     lines = content.split("\n")
 
     metrics = {
@@ -52,10 +81,164 @@ def analyze_python(content: str) -> dict:
         "imports": 0,
     }
 
-    in_docstring = False
-    docstring_char = None
+    blank_rows = set()
+    # Rows whose first non-blank character is "#": comments, unless they sit
+    # inside a multi-line string
+    hash_rows = set()
+    for row, line in enumerate(lines, 1):
+        stripped = line.strip()
+        if not stripped:
+            blank_rows.add(row)
+        elif stripped[0] == "#":
+            hash_rows.add(row)
+
+    hash_row_list = sorted(hash_rows)
+    comment_rows = set()
+
+    # Functions, classes and imports are statements, so only statement lists
+    # are traversed; expressions are walked just where a "#" row could be
+    # string content
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            metrics["functions"] += 1
+        elif isinstance(node, ast.ClassDef):
+            metrics["classes"] += 1
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            metrics["imports"] += 1
+
+        # Docstrings count as comment lines
+        if isinstance(node, DOCSTRING_OWNERS) and node.body:
+            first = node.body[0]
+            if (
+                isinstance(first, ast.Expr)
+                and isinstance(first.value, ast.Constant)
+                and isinstance(first.value.value, str)
+            ):
+                comment_rows.update(range(first.lineno, first.end_lineno + 1))
+
+        if isinstance(node, ast.Module):
+            start = spans_hash_row = None
+        else:
+            start = statement_start(node)
+            later = bisect.bisect_right(hash_row_list, start)
+            spans_hash_row = later < len(hash_row_list) and (
+                # match_case has no end position of its own
+                not hasattr(node, "end_lineno") or hash_row_list[later] <= node.end_lineno
+            )
+
+        string_rows = set()
+        for field, value in ast.iter_fields(node):
+            if field in STATEMENT_FIELDS:
+                stack.extend(value)
+            elif spans_hash_row:
+                string_rows |= multiline_string_rows(value)
+
+        # A "#" row inside a string's span may still be a comment between
+        # implicitly concatenated literals, so only there is the statement
+        # tokenized to tell the two apart. Docstring rows (added by the parent
+        # before its body is popped) count as comments either way.
+        in_strings = (hash_rows & string_rows) - comment_rows
+        if in_strings:
+            hash_rows -= in_strings - comment_token_rows(lines, start, max(string_rows))
+
+    # Only lines holding nothing but a comment count; trailing comments are code
+    comment_rows |= hash_rows
+
+    metrics["blank_lines"] = len(blank_rows)
+    metrics["comment_lines"] = len(comment_rows - blank_rows)
+    metrics["code_lines"] = (
+        metrics["total_lines"] - metrics["blank_lines"] - metrics["comment_lines"]
+    )
+
+    return metrics
 
-    for line in lines:
+
+def statement_start(node) -> int:
+    """Return the first row of a statement, including its decorators."""
+    if not hasattr(node, "lineno"):
+        # match_case
+        return node.pattern.lineno
+    return min([node.lineno] + [deco.lineno for deco in getattr(node, "decorator_list", ())])
+
+
+def comment_token_rows(lines: list, start: int, end: int) -> set:
+    """Return the rows between start and end holding only a comment token."""
+    rows = set()
+    readline = iter([line + "\n" for line in lines[start - 1:end]] + [""]).__next__
+    try:
+        for tok in tokenize.generate_tokens(readline):
+            if tok.type == tokenize.COMMENT and not tok.line[:tok.start[1]].strip():
+                rows.add(start + tok.start[0] - 1)
+    except (SyntaxError, tokenize.TokenError):
+        # The slice ends mid-statement; the comments before that still count
+        pass
+    return rows
+
+
+def multiline_string_rows(value) -> set:
+    """Return the rows after the first of every multi-line string in value.
+
+    value is an AST node, a list of them, or a plain field value.
+    """
+    rows = set()
+    nodes = value if isinstance(value, list) else [value]
+    for top in nodes:
+        if not isinstance(top, ast.AST):
+            continue
+        for node in ast.walk(top):
+            if isinstance(node, (ast.Constant, ast.JoinedStr)) and node.end_lineno > node.lineno:
+                rows.update(range(node.lineno + 1, node.end_lineno + 1))
+    return rows
+
+
+def docstring_rows(content: str) -> set:
+    """Return the 0-based line numbers covered by triple-quoted strings.
+
+    Quotes are paired in one pass over TRIPLE_QUOTE matches: an opening
+    quote is closed by the next quote of the same kind, and an unclosed one
+    runs to the end of the file.
+    """
+    rows = set()
+    row = 0
+    last = 0
+    opener = None
+    open_row = 0
+
+    for match in TRIPLE_QUOTE.finditer(content):
+        row += content.count("\n", last, match.start())
+        last = match.start()
+        if opener is None:
+            opener, open_row = match.group(), row
+        elif match.group() == opener:
+            rows.update(range(open_row, row + 1))
+            opener = None
+
+    if opener is not None:
+        rows.update(range(open_row, row + content.count("\n", last) + 1))
+
+    return rows
+
+
+def analyze_python_lines(content: str) -> dict:
+    """Analyze Python code line by line, for sources ast cannot parse."""
+    lines = content.split("\n")
+
+    metrics = {
+        "language": "python",
+        "total_lines": len(lines),
+        "code_lines": 0,
+        "comment_lines": 0,
+        "blank_lines": 0,
+        "functions": 0,
+        "classes": 0,
+        "imports": 0,
+    }
+
+    doc_rows = docstring_rows(content)
+
+    for row, line in enumerate(lines):
         stripped = line.strip()
 
         if not stripped:
@@ -63,21 +246,7 @@ def analyze_python(content: str) -> dict:
             continue
 
         # Check for docstrings
-        if '"""' in stripped or "'''" in stripped:
-            if not in_docstring:
-                in_docstring = True
-                docstring_char = '"""' if '"""' in stripped else "'''"
-                if stripped.count(docstring_char) >= 2:
-                    in_docstring = False
-                metrics["comment_lines"] += 1
-                continue
-            else:
-                if docstring_char in stripped:
-                    in_docstring = False
-                metrics["comment_lines"] += 1
-                continue
-
-        if in_docstring:
+        if row in doc_rows:
             metrics["comment_lines"] += 1
             continue
 
@@ -88,17 +257,10 @@ def analyze_python(content: str) -> dict:
 
         metrics["code_lines"] += 1
 
-        # Check for functions
-        if re.match(r"^(async\s+)?def\s+\w+", stripped):
-            metrics["functions"] += 1
-
-        # Check for classes
-        if re.match(r"^class\s+\w+", stripped):
-            metrics["classes"] += 1
-
-        # Check for imports
-        if stripped.startswith("import ") or stripped.startswith("from "):
-            metrics["imports"] += 1
+        # Check for functions, classes and imports
+        match = PY_CODE.match(stripped)
+        if match:
+            metrics[match.lastgroup] += 1
 
     return metrics
 
@@ -147,15 +309,15 @@ def analyze_javascript(content: str) -> dict:
         metrics["code_lines"] += 1
 
         # Check for functions
-        if re.search(r"(function\s+\w+|const\s+\w+\s*=\s*(async\s+)?\(|=>\s*\{)", stripped):
+        if JS_FUNCTION.search(stripped):
             metrics["functions"] += 1
 
         # Check for classes
-        if re.match(r"^(export\s+)?(abstract\s+)?class\s+\w+", stripped):
+        if JS_CLASS.match(stripped):
             metrics["classes"] += 1
 
         # Check for imports
-        if stripped.startswith("import ") or stripped.startswith("export "):
+        if stripped.startswith(("import ", "export ")):
             metrics["imports"] += 1
 
     return metrics
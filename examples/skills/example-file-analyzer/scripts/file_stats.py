@@ -6,6 +6,12 @@ Description:
     Analyze a file and return statistics including line count,
     word count, character count, and file size.
 
+    Like text mode, "\n", "\r\n" and a bare "\r" each end a line, and
+    characters are counted as decoded UTF-8. Words and empty lines are judged
+    by ASCII whitespace (including the \x1c-\x1f separators, as str.split
+    does) only, so Unicode spaces such as U+00A0 or U+3000 neither separate
+    words nor make a line count as empty.
+
 Parameters:
     file_path (str): Path to the file to analyze
     --format (str): Output format (text|json) (default: text)
@@ -19,23 +25,60 @@ Examples:
 """
 
 import argparse
+import errno
 import os
+import stat
 import sys
 import json
 
+CHUNK_SIZE = 1 << 20
+# ASCII separators that str.split() treats as whitespace but bytes.split()
+# does not
+SEPARATOR_BYTES = b"\x1c\x1d\x1e\x1f"
+SEPARATORS_TO_SPACE = bytes.maketrans(SEPARATOR_BYTES, b" " * len(SEPARATOR_BYTES))
+# Line-local ASCII whitespace; a line holding only these counts as empty
+BLANK_BYTES = b" \t\r\f\v" + SEPARATOR_BYTES
+
+
+def add_block_stats(stats: dict, block: bytes) -> None:
+    """Add the counts for block (whole lines, or the final partial line)."""
+    # Translate line endings the way text mode does
+    if b"\r" in block:
+        block = block.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    stats["lines"] += block.count(b"\n") + (not block.endswith(b"\n"))
+    if any(sep in block for sep in SEPARATOR_BYTES):
+        stats["words"] += len(block.translate(SEPARATORS_TO_SPACE).split())
+    else:
+        stats["words"] += len(block.split())
+    # ASCII is one character per byte, so only other blocks pay for a decode
+    if block.isascii():
+        stats["characters"] += len(block)
+    else:
+        stats["characters"] += len(block.decode("utf-8", errors="replace"))
+    parts = block.translate(None, BLANK_BYTES).split(b"\n")
+    stats["non_empty_lines"] += len(parts) - parts.count(b"")
+
 
 def get_file_stats(file_path: str) -> dict:
     """Get statistics for a file."""
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"File not found: {file_path}")
-
-    if not os.path.isfile(file_path):
+    # One stat answers existence, type and size
+    try:
+        st = os.stat(file_path)
+    except OSError as e:
+        # Paths that cannot name an existing file report as missing, like
+        # os.path.exists; anything else (e.g. EACCES) is a read error
+        if isinstance(e, (FileNotFoundError, NotADirectoryError)) or \
+                e.errno in (errno.ENAMETOOLONG, errno.ELOOP):
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+        raise RuntimeError(f"Error reading file: {e}") from None
+
+    if not stat.S_ISREG(st.st_mode):
         raise ValueError(f"Not a file: {file_path}")
 
     stats = {
         "file_path": os.path.abspath(file_path),
         "file_name": os.path.basename(file_path),
-        "file_size_bytes": os.path.getsize(file_path),
+        "file_size_bytes": st.st_size,
         "lines": 0,
         "words": 0,
         "characters": 0,
@@ -43,34 +86,48 @@ def get_file_stats(file_path: str) -> dict:
     }
 
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            for line in f:
-                stats["lines"] += 1
-                stats["characters"] += len(line)
-                stats["words"] += len(line.split())
-                if line.strip():
-                    stats["non_empty_lines"] += 1
+        # Count in C over binary chunks split at line boundaries; a UTF-8
+        # sequence never contains b"\n", so each block decodes on its own.
+        # Cutting after "\n" also keeps every "\r\n" pair in one block.
+        with open(file_path, 'rb') as f:
+            # Pieces of the unfinished line, joined only once its newline
+            # arrives so long lines are not re-copied on every read
+            pending = []
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                cut = chunk.rfind(b"\n") + 1
+                if not cut:
+                    pending.append(chunk)
+                    continue
+                pending.append(chunk[:cut])
+                add_block_stats(stats, b"".join(pending))
+                pending = [chunk[cut:]] if cut < len(chunk) else []
+            if pending:
+                add_block_stats(stats, b"".join(pending))
     except Exception as e:
         raise RuntimeError(f"Error reading file: {e}")
 
-    # Format file size
-    size = stats["file_size_bytes"]
-    if size < 1024:
-        stats["file_size"] = f"{size} B"
-    elif size < 1024 * 1024:
-        stats["file_size"] = f"{size / 1024:.2f} KB"
-    else:
-        stats["file_size"] = f"{size / (1024 * 1024):.2f} MB"
-
     return stats
 
 
+def format_size(size: int) -> str:
+    """Format a byte count for display."""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.2f} KB"
+    return f"{size / (1024 * 1024):.2f} MB"
+
+
 def format_text(stats: dict) -> str:
     """Format stats as text output."""
+    size = stats["file_size_bytes"]
     lines = [
         f"File: {stats['file_name']}",
         f"Path: {stats['file_path']}",
-        f"Size: {stats['file_size']} ({stats['file_size_bytes']} bytes)",
+        f"Size: {format_size(size)} ({size} bytes)",
         f"Lines: {stats['lines']} (non-empty: {stats['non_empty_lines']})",
         f"Words: {stats['words']}",
         f"Characters: {stats['characters']}",